@@ -0,0 +1,245 @@
+import gzip
+import importlib.util
+import json
+import os
+from unittest import mock
+
+import pytest
+import requests
+
+ABSOLUTE_FIRECRAWL_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "firecrawl.py")
+
+spec = importlib.util.spec_from_file_location("FirecrawlApp", ABSOLUTE_FIRECRAWL_PATH)
+firecrawl = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(firecrawl)
+FirecrawlApp = firecrawl.FirecrawlApp
+
+API_URL = "http://127.0.0.1:3002"
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    firecrawl._pools.clear()
+    yield
+    firecrawl._pools.clear()
+
+def test_clients_share_pool_but_not_cookies():
+    app1 = FirecrawlApp(api_key="k1", api_url=API_URL)
+    app2 = FirecrawlApp(api_key="k2", api_url=API_URL)
+    assert app1._session is not app2._session
+    assert app1._session.get_adapter(API_URL) is app2._session.get_adapter(API_URL)
+
+    app1._session.cookies.set("session", "for-k1")
+    assert "session" not in app2._session.cookies
+
+def test_close_keeps_shared_pool_open():
+    app1 = FirecrawlApp(api_key="k1", api_url=API_URL)
+    app2 = FirecrawlApp(api_key="k2", api_url=API_URL)
+    adapter = app2._session.get_adapter(API_URL)
+    with mock.patch.object(adapter, "close") as close:
+        with app1:
+            pass
+        close.assert_not_called()
+    assert app2._session.get_adapter(API_URL) is adapter
+    assert FirecrawlApp(api_key="k3", api_url=API_URL)._session.get_adapter(API_URL) is adapter
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_does_not_reuse_parent_pool():
+    parent_adapter = FirecrawlApp(api_key="k1", api_url=API_URL)._session.get_adapter(API_URL)
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        child_adapter = FirecrawlApp(api_key="k2", api_url=API_URL)._session.get_adapter(API_URL)
+        os.write(write_end, b"shared" if child_adapter is parent_adapter else b"fresh")
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as reader:
+        result = reader.read()
+    os.waitpid(pid, 0)
+    assert result == b"fresh"
+    assert FirecrawlApp(api_key="k3", api_url=API_URL)._session.get_adapter(API_URL) is parent_adapter
+
+def make_response(status_code, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+def test_get_request_answers_304_from_cache():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    url = f"{API_URL}/v0/crawl/status/job"
+    fresh = make_response(200, b'{"status": "active"}', {"ETag": 'W/"1"'})
+    with mock.patch.object(app._session, "get", side_effect=[fresh, make_response(304)]) as get:
+        assert app._get_request(url, app._prepare_headers()) is fresh
+        assert app._get_request(url, app._prepare_headers()) is fresh
+    assert "If-None-Match" not in get.call_args_list[0].kwargs["headers"]
+    assert get.call_args_list[1].kwargs["headers"]["If-None-Match"] == 'W/"1"'
+
+def test_etag_cache_is_bounded():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    responses = [make_response(200, b"{}", {"ETag": f'W/"{i}"'}) for i in range(firecrawl.ETAG_CACHE_SIZE + 5)]
+    with mock.patch.object(app._session, "get", side_effect=responses):
+        for i in range(len(responses)):
+            app._get_request(f"{API_URL}/v0/crawl/status/job{i}", app._prepare_headers())
+    assert len(app._etag_cache) == firecrawl.ETAG_CACHE_SIZE
+    assert f"{API_URL}/v0/crawl/status/job0" not in app._etag_cache
+
+def test_finished_crawl_is_dropped_from_etag_cache():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    done = make_response(200, b'{"status": "completed", "data": [{"content": "x"}]}', {"ETag": 'W/"2"'})
+    with mock.patch.object(app._session, "get", return_value=done):
+        assert app._monitor_job_status("job", app._prepare_headers(), 2) == [{"content": "x"}]
+    assert not app._etag_cache
+
+def test_poll_jitter_never_goes_below_floor():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    active = make_response(200, b'{"status": "active", "current": 1}')
+    done = make_response(200, b'{"status": "completed", "data": []}')
+    with mock.patch.object(app._session, "get", side_effect=[active, done]), \
+         mock.patch.object(firecrawl.random, "uniform", return_value=0.8), \
+         mock.patch.object(firecrawl.time, "sleep") as sleep:
+        app._monitor_job_status("job", app._prepare_headers(), 2)
+    sleep.assert_called_once_with(firecrawl.MIN_POLL_INTERVAL)
+
+def test_crawl_url_times_out_without_sleeping_past_deadline():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    clock = [100.0]
+    sleeps = []
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+    started = make_response(200, b'{"jobId": "job"}')
+    active = make_response(200, b'{"status": "active", "current": 1}')
+    with mock.patch.object(app._session, "post", return_value=started), \
+         mock.patch.object(app._session, "get", return_value=active), \
+         mock.patch.object(firecrawl.random, "uniform", return_value=1.0), \
+         mock.patch.object(firecrawl.time, "monotonic", side_effect=lambda: clock[0]), \
+         mock.patch.object(firecrawl.time, "sleep", side_effect=fake_sleep):
+        with pytest.raises(TimeoutError) as excinfo:
+            app.crawl_url("https://x.com", poll_interval=2, timeout=4)
+    # The second wait would be 3 s after back-off, but only 2 s remain
+    assert sleeps == [2, 2]
+    assert clock[0] == 104.0
+    assert str(excinfo.value) == "Crawl job job did not complete within 4 seconds"
+
+def test_retry_delay_jitter_bounds():
+    response = make_response(503)
+    for attempt in range(4):
+        base = 0.5 * (2 ** attempt)
+        for _ in range(50):
+            assert 0.5 * base <= firecrawl._retry_delay(response, attempt, 0.5) <= 1.5 * base
+
+def test_retry_delay_honours_numeric_retry_after():
+    response = make_response(429, headers={"Retry-After": "7"})
+    assert firecrawl._retry_delay(response, 0, 0.5) == 7
+
+def test_retry_delay_honours_http_date_retry_after():
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=20)
+    response = make_response(503, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+    assert 18 <= firecrawl._retry_delay(response, 0, 0.5) <= 20
+
+def test_retry_delay_ignores_invalid_retry_after():
+    response = make_response(503, headers={"Retry-After": "soon"})
+    assert firecrawl._retry_delay(response, 0, 0.5) <= 0.75
+
+def test_retry_delay_is_capped():
+    cap = firecrawl.MAX_RETRY_DELAY
+    assert firecrawl._retry_delay(make_response(429, headers={"Retry-After": "3600"}), 0, 0.5) == cap
+    with mock.patch.object(firecrawl.random, "uniform", return_value=1.0):
+        assert firecrawl._retry_delay(make_response(503), 20, 0.5) == cap
+
+@pytest.mark.parametrize("status_code", [503, 504])
+def test_post_without_idempotency_key_is_not_retried_on_gateway_errors(status_code):
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    with mock.patch.object(app._session, "post", return_value=make_response(status_code)) as post, \
+         mock.patch.object(firecrawl.time, "sleep"):
+        app._post_request(f"{API_URL}/v0/crawl", {"url": "https://x.com"}, app._prepare_headers())
+    assert post.call_count == 1
+
+def test_post_with_idempotency_key_is_retried_on_gateway_errors():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    responses = [make_response(504), make_response(200, b"{}")]
+    with mock.patch.object(app._session, "post", side_effect=responses) as post, \
+         mock.patch.object(firecrawl.time, "sleep"):
+        response = app._post_request(f"{API_URL}/v0/crawl", {"url": "https://x.com"}, app._prepare_headers("key"))
+    assert response.status_code == 200
+    assert post.call_count == 2
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_invalid_json_raises_requests_error_with_or_without_orjson(use_orjson):
+    if use_orjson and firecrawl.orjson is None:
+        pytest.skip("orjson is not installed")
+    orjson = firecrawl.orjson if use_orjson else None
+    with mock.patch.object(firecrawl, "orjson", orjson):
+        with pytest.raises(requests.exceptions.JSONDecodeError) as excinfo:
+            firecrawl._json_loads(make_response(200, b"<html>Bad Gateway</html>"))
+    assert isinstance(excinfo.value, requests.RequestException)
+
+@pytest.mark.parametrize("body", [b"[]", b'"oops"', b"null"])
+def test_scrape_url_rejects_non_object_success_body(body):
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    with mock.patch.object(app._session, "post", return_value=make_response(200, body)):
+        with pytest.raises(Exception) as excinfo:
+            app.scrape_url("https://x.com")
+    assert "Failed to scrape URL. Error: Unknown error occurred" in str(excinfo.value)
+
+@pytest.mark.parametrize("body", [b"[]", b'"oops"', b"null", b"{}"])
+def test_crawl_url_rejects_body_without_job_id(body):
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    with mock.patch.object(app._session, "post", return_value=make_response(200, body)):
+        with pytest.raises(Exception) as excinfo:
+            app.crawl_url("https://x.com", wait_until_done=False)
+    assert "Failed to start crawl job. Error: No job ID returned" in str(excinfo.value)
+
+@pytest.mark.parametrize("body, error", [
+    (b"[]", "No status returned"),
+    (b"null", "No status returned"),
+    (b'{"error": "Job expired"}', "Job expired"),
+])
+def test_monitor_job_status_rejects_body_without_status(body, error):
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    with mock.patch.object(app._session, "get", return_value=make_response(200, body)):
+        with pytest.raises(Exception) as excinfo:
+            app._monitor_job_status("job", app._prepare_headers(), 2)
+    assert f"Failed to check crawl status. Error: {error}" in str(excinfo.value)
+
+@pytest.mark.parametrize("body", [b'"oops"', b"[]", b"<html>Bad Gateway</html>", b""])
+def test_handle_error_tolerates_non_object_body(body):
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    with pytest.raises(requests.exceptions.HTTPError) as excinfo:
+        app._handle_error(make_response(500, body), "search")
+    assert "Internal Server Error: Failed to search. No additional error details provided." in str(excinfo.value)
+
+def test_large_bodies_are_sent_uncompressed_by_default():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    payload = {"url": "https://x.com", "pageOptions": {"k": "v" * 3000}}
+    with mock.patch.object(app._session, "post", return_value=make_response(200, b"{}")) as post:
+        app._post_request(f"{API_URL}/v0/scrape", payload, app._prepare_headers())
+    assert "Content-Encoding" not in post.call_args.kwargs["headers"]
+    assert json.loads(post.call_args.kwargs["data"]) == payload
+
+def test_large_bodies_are_gzipped_when_enabled():
+    app = FirecrawlApp(api_key="k", api_url=API_URL, compress_requests=True)
+    small = {"url": "https://x.com"}
+    large = {"url": "https://x.com", "pageOptions": {"k": "v" * 3000}}
+    with mock.patch.object(app._session, "post", return_value=make_response(200, b"{}")) as post:
+        app._post_request(f"{API_URL}/v0/scrape", small, app._prepare_headers())
+        assert "Content-Encoding" not in post.call_args.kwargs["headers"]
+        app._post_request(f"{API_URL}/v0/scrape", large, app._prepare_headers())
+    assert post.call_args.kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(post.call_args.kwargs["data"])) == large
+    assert "Content-Encoding" not in app._prepare_headers()
+
+def test_default_headers_are_read_only():
+    app = FirecrawlApp(api_key="k", api_url=API_URL)
+    headers = app._prepare_headers()
+    with pytest.raises(TypeError):
+        headers["X-Extra"] = "1"
+    assert "X-Extra" not in app._prepare_headers()
+    assert "x-idempotency-key" not in headers
+    assert app._prepare_headers("key")["x-idempotency-key"] == "key"
+    prepared = app._session.prepare_request(requests.Request("POST", f"{API_URL}/v0/scrape", headers=headers))
+    assert prepared.headers["Authorization"] == "Bearer k"
@@ -9,15 +9,149 @@ and handles retries for certain HTTP status codes.
 Classes:
     - FirecrawlApp: Main class for interacting with the Firecrawl API.
 """
+import gzip
+import json
 import logging
 import os
+import random
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, see the "fast" extra
+    orjson = None
 
 logger : logging.Logger = logging.getLogger("firecrawl")
 
+# With compress_requests, bodies larger than this many bytes are sent gzip-compressed
+GZIP_MIN_BODY_SIZE = 1024
+
+# Number of GET responses kept per client for conditional requests
+ETAG_CACHE_SIZE = 16
+
+# Crawl job states in which the job is still expected to finish
+PENDING_CRAWL_STATUSES = frozenset({'active', 'paused', 'pending', 'queued', 'waiting'})
+
+# Lower bound in seconds between crawl status checks, to stay within the API's rate limit
+MIN_POLL_INTERVAL = 2
+
+# Upper bound in seconds for the crawl status poll interval while a job makes no progress
+MAX_POLL_INTERVAL = 30
+
+# Status codes for transient failures that are worth retrying
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# A 503 or 504 may come after the server already processed a POST, so POSTs without
+# an idempotency key are only retried on these, to avoid starting duplicate jobs
+UNSAFE_RETRYABLE_STATUS_CODES = frozenset({429, 502})
+
+# Upper bound in seconds for a single wait between retries
+MAX_RETRY_DELAY = 60
+
+# Connection pools shared by all FirecrawlApp instances that target the same API with
+# the same pool size. They live for the whole process so that short-lived clients
+# created one after another keep reusing the same keep-alive connections. A forked
+# child starts with no pools, see _reset_pools_after_fork.
+_pools: Dict[Tuple[str, int], HTTPAdapter] = {}
+_pools_lock = threading.Lock()
+
+
+def _reset_pools_after_fork() -> None:
+    """Forget the parent's pools in a forked child, so processes never share a socket."""
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def _json_loads(response: requests.Response) -> Any:
+    """
+    Parse a JSON response body, using orjson when it is installed.
+
+    Invalid JSON raises requests.exceptions.JSONDecodeError either way, so callers
+    catching requests.RequestException see the same error with or without orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+    return response.json()
+
+
+def _retry_delay(response: requests.Response, attempt: int, backoff_factor: float) -> float:
+    """
+    Compute how long to wait before retrying a request.
+
+    Exponential backoff is jittered by +/-50% so that clients throttled at the same
+    time do not retry in lockstep, and a longer Retry-After from the server wins.
+    """
+    delay = min(backoff_factor * (2 ** attempt), MAX_RETRY_DELAY) * random.uniform(0.5, 1.5)
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            server_delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                server_delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                server_delay = 0
+        delay = max(delay, min(server_delay, MAX_RETRY_DELAY))
+
+    return delay
+
+
+def _warm_up(adapter: HTTPAdapter, api_url: str) -> None:
+    """Open a pooled connection to the API ahead of the first real request."""
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    try:
+        session.head(api_url, timeout=10)
+    except requests.RequestException as e:
+        logger.debug("Connection warm-up to %s failed: %s", api_url, e)
+
+
+def _get_adapter(api_url: str, max_concurrency: int, prewarm: bool = False) -> HTTPAdapter:
+    """
+    Return the shared connection pool for an API URL, creating it on first use.
+
+    Only the pool is shared: each client keeps its own session, so cookies set for one
+    API key are never sent on behalf of another. With prewarm, a new pool connects to
+    the API in a background thread.
+    """
+    key = (api_url, max_concurrency)
+    with _pools_lock:
+        adapter = _pools.get(key)
+        created = adapter is None
+        if created:
+            adapter = _pools[key] = HTTPAdapter(pool_maxsize=max_concurrency)
+    if created and prewarm:
+        threading.Thread(target=_warm_up, args=(adapter, api_url), daemon=True).start()
+    return adapter
+
+
 class FirecrawlApp:
     """
     Initialize the FirecrawlApp instance.
@@ -25,8 +159,18 @@ class FirecrawlApp:
     Args:
         api_key (Optional[str]): API key for authenticating with the Firecrawl API.
         api_url (Optional[str]): Base URL for the Firecrawl API.
+        max_concurrency (int): Maximum number of pooled connections kept open to the API,
+            which should match the number of threads sharing this instance.
+        prewarm (bool): Open a connection to the API in the background right away, so the
+            first call does not pay for DNS, TCP and TLS setup.
+        compress_requests (bool): Gzip request bodies larger than GZIP_MIN_BODY_SIZE. Only
+            enable this if every proxy between you and the API accepts compressed bodies.
     """
-    def __init__(self, api_key: Optional[str] = None, api_url: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None,
+                 api_url: Optional[str] = None,
+                 max_concurrency: int = 32,
+                 prewarm: bool = False,
+                 compress_requests: bool = False) -> None:
         self.api_key = api_key or os.getenv('FIRECRAWL_API_KEY')
         if self.api_key is None:
             logger.warning("No API key provided")
@@ -38,6 +182,42 @@ class FirecrawlApp:
         if self.api_url != 'https://api.firecrawl.dev':
             logger.debug("Initialized FirecrawlApp with API URL: %s", self.api_url)
 
+        self.compress_requests = compress_requests
+
+        # Default headers are built once and shared by every request, hence read-only
+        self._headers: Mapping[str, str] = MappingProxyType({
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.api_key}',
+        })
+
+        # Per-client session on top of a connection pool shared across clients, so
+        # requests reuse keep-alive connections without sharing cookies
+        adapter = _get_adapter(self.api_url, max_concurrency, prewarm)
+        self._session = requests.Session()
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # Last ETag and response seen per GET URL, used for conditional requests. Kept
+        # as a small LRU since crawl status payloads can be large.
+        self._etag_cache: 'OrderedDict[str, Tuple[str, requests.Response]]' = OrderedDict()
+        self._etag_lock = threading.Lock()
+
+    def close(self) -> None:
+        """
+        Detach this client from the shared connection pool.
+
+        The pool itself stays open for other and future clients of the same API URL,
+        so closing one client never drops connections another client is using. The
+        client must not be used after calling close().
+        """
+        self._session.adapters.clear()
+
+    def __enter__(self) -> 'FirecrawlApp':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def scrape_url(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
         Scrape the specified URL using the Firecrawl API.
@@ -76,17 +256,15 @@ class FirecrawlApp:
                 if key != 'extractorOptions':
                     scrape_params[key] = value
         # Make the POST request with the prepared headers and JSON data
-        response = requests.post(
-            f'{self.api_url}/v0/scrape',
-            headers=headers,
-            json=scrape_params,
-        )
+        response = self._post_request(f'{self.api_url}/v0/scrape', scrape_params, headers)
         if response.status_code == 200:
-            response = response.json()
-            if response['success'] and 'data' in response:
+            response = _json_loads(response)
+            if not isinstance(response, dict):
+                response = {}
+            if response.get('success') and 'data' in response:
                 return response['data']
             else:
-                raise Exception(f'Failed to scrape URL. Error: {response["error"]}')
+                raise Exception(f'Failed to scrape URL. Error: {response.get("error", "Unknown error occurred")}')
         else:
             self._handle_error(response, 'scrape URL')
 
@@ -108,18 +286,16 @@ class FirecrawlApp:
         json_data = {'query': query}
         if params:
             json_data.update(params)
-        response = requests.post(
-            f'{self.api_url}/v0/search',
-            headers=headers,
-            json=json_data
-        )
+        response = self._post_request(f'{self.api_url}/v0/search', json_data, headers)
         if response.status_code == 200:
-            response = response.json()
+            response = _json_loads(response)
+            if not isinstance(response, dict):
+                response = {}
 
-            if response['success'] and 'data' in response:
+            if response.get('success') and 'data' in response:
                 return response['data']
             else:
-                raise Exception(f'Failed to search. Error: {response["error"]}')
+                raise Exception(f'Failed to search. Error: {response.get("error", "Unknown error occurred")}')
 
         else:
             self._handle_error(response, 'search')
@@ -128,7 +304,9 @@ class FirecrawlApp:
                   params: Optional[Dict[str, Any]] = None,
                   wait_until_done: bool = True,
                   poll_interval: int = 2,
-                  idempotency_key: Optional[str] = None) -> Any:
+                  idempotency_key: Optional[str] = None,
+                  max_poll_interval: Optional[int] = None,
+                  timeout: Optional[float] = None) -> Any:
         """
         Initiate a crawl job for the specified URL using the Firecrawl API.
 
@@ -138,12 +316,17 @@ class FirecrawlApp:
             wait_until_done (bool): Whether to wait until the crawl job is completed.
             poll_interval (int): Time in seconds between status checks when waiting for job completion.
             idempotency_key (Optional[str]): A unique uuid key to ensure idempotency of requests.
+            max_poll_interval (Optional[int]): Upper bound in seconds for the status check interval
+                while the job makes no progress. Defaults to MAX_POLL_INTERVAL.
+            timeout (Optional[float]): Maximum time in seconds to wait for the job to complete.
+                Waits indefinitely if not set.
 
         Returns:
             Any: The crawl job ID or the crawl results if waiting until completion.
 
         Raises:
             Exception: If the crawl job initiation or monitoring fails.
+            TimeoutError: If the job does not complete within the timeout.
         """
         headers = self._prepare_headers(idempotency_key)
         json_data = {'url': url}
@@ -151,9 +334,14 @@ class FirecrawlApp:
             json_data.update(params)
         response = self._post_request(f'{self.api_url}/v0/crawl', json_data, headers)
         if response.status_code == 200:
-            job_id = response.json().get('jobId')
+            response = _json_loads(response)
+            if not isinstance(response, dict):
+                response = {}
+            job_id = response.get('jobId')
+            if not job_id:
+                raise Exception(f'Failed to start crawl job. Error: {response.get("error", "No job ID returned")}')
             if wait_until_done:
-                return self._monitor_job_status(job_id, headers, poll_interval)
+                return self._monitor_job_status(job_id, headers, poll_interval, max_poll_interval, timeout)
             else:
                 return {'jobId': job_id}
         else:
@@ -175,11 +363,11 @@ class FirecrawlApp:
         headers = self._prepare_headers()
         response = self._get_request(f'{self.api_url}/v0/crawl/status/{job_id}', headers)
         if response.status_code == 200:
-            return response.json()
+            return _json_loads(response)
         else:
             self._handle_error(response, 'check crawl status')
 
-    def _prepare_headers(self, idempotency_key: Optional[str] = None) -> Dict[str, str]:
+    def _prepare_headers(self, idempotency_key: Optional[str] = None) -> Mapping[str, str]:
         """
         Prepare the headers for API requests.
 
@@ -187,32 +375,34 @@ class FirecrawlApp:
             idempotency_key (Optional[str]): A unique key to ensure idempotency of requests.
 
         Returns:
-            Dict[str, str]: The headers including content type, authorization, and optionally idempotency key.
+            Mapping[str, str]: The headers including content type, authorization, and optionally idempotency key.
+                Without an idempotency key this is the client's shared, read-only mapping, so copy
+                it before adding per-call headers.
         """
         if idempotency_key:
-            return {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.api_key}',
-                'x-idempotency-key': idempotency_key
-            }
+            return {**self._headers, 'x-idempotency-key': idempotency_key}
 
-        return {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}',
-        }
+        return self._headers
 
     def _post_request(self, url: str,
                       data: Dict[str, Any],
-                      headers: Dict[str, str],
+                      headers: Mapping[str, str],
                       retries: int = 3,
                       backoff_factor: float = 0.5) -> requests.Response:
         """
         Make a POST request with retries.
 
+        Responses with a status in RETRYABLE_STATUS_CODES are retried after a
+        jittered exponential backoff, or after the server's Retry-After if longer.
+        Without an x-idempotency-key header, only UNSAFE_RETRYABLE_STATUS_CODES are.
+
+        With compress_requests enabled, bodies larger than GZIP_MIN_BODY_SIZE are
+        gzip-compressed before upload.
+
         Args:
             url (str): The URL to send the POST request to.
             data (Dict[str, Any]): The JSON data to include in the POST request.
-            headers (Dict[str, str]): The headers to include in the POST request.
+            headers (Mapping[str, str]): The headers to include in the POST request.
             retries (int): Number of retries for the request.
             backoff_factor (float): Backoff factor for retries.
 
@@ -222,24 +412,38 @@ class FirecrawlApp:
         Raises:
             requests.RequestException: If the request fails after the specified retries.
         """
+        body = _json_dumps(data)
+        if self.compress_requests and len(body) > GZIP_MIN_BODY_SIZE:
+            body = gzip.compress(body, compresslevel=4)
+            headers = {**headers, 'Content-Encoding': 'gzip'}
+
+        if 'x-idempotency-key' in headers:
+            retryable = RETRYABLE_STATUS_CODES
+        else:
+            retryable = UNSAFE_RETRYABLE_STATUS_CODES
+
         for attempt in range(retries):
-            response = requests.post(url, headers=headers, json=data)
-            if response.status_code == 502:
-                time.sleep(backoff_factor * (2 ** attempt))
+            response = self._session.post(url, headers=headers, data=body)
+            if response.status_code in retryable and attempt < retries - 1:
+                time.sleep(_retry_delay(response, attempt, backoff_factor))
             else:
                 return response
         return response
 
     def _get_request(self, url: str,
-                     headers: Dict[str, str],
+                     headers: Mapping[str, str],
                      retries: int = 3,
                      backoff_factor: float = 0.5) -> requests.Response:
         """
-        Make a GET request with retries.
+        Make a GET request with retries, using the same policy as _post_request.
+
+        If a previous response for the same URL carried an ETag, it is sent back
+        as If-None-Match and a 304 Not Modified reply is answered from the cache,
+        which holds the ETAG_CACHE_SIZE most recently used URLs.
 
         Args:
             url (str): The URL to send the GET request to.
-            headers (Dict[str, str]): The headers to include in the GET request.
+            headers (Mapping[str, str]): The headers to include in the GET request.
             retries (int): Number of retries for the request.
             backoff_factor (float): Backoff factor for retries.
 
@@ -249,43 +453,98 @@ class FirecrawlApp:
         Raises:
             requests.RequestException: If the request fails after the specified retries.
         """
+        with self._etag_lock:
+            cached = self._etag_cache.get(url)
+            if cached:
+                self._etag_cache.move_to_end(url)
+        if cached:
+            headers = {**headers, 'If-None-Match': cached[0]}
+
         for attempt in range(retries):
-            response = requests.get(url, headers=headers)
-            if response.status_code == 502:
-                time.sleep(backoff_factor * (2 ** attempt))
+            response = self._session.get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached[1]
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < retries - 1:
+                time.sleep(_retry_delay(response, attempt, backoff_factor))
             else:
+                etag = response.headers.get('ETag')
+                if response.status_code == 200 and etag:
+                    with self._etag_lock:
+                        self._etag_cache[url] = (etag, response)
+                        self._etag_cache.move_to_end(url)
+                        if len(self._etag_cache) > ETAG_CACHE_SIZE:
+                            self._etag_cache.popitem(last=False)
                 return response
         return response
 
-    def _monitor_job_status(self, job_id: str, headers: Dict[str, str], poll_interval: int) -> Any:
+    def _monitor_job_status(self, job_id: str,
+                            headers: Mapping[str, str],
+                            poll_interval: int,
+                            max_poll_interval: Optional[int] = None,
+                            timeout: Optional[float] = None) -> Any:
         """
         Monitor the status of a crawl job until completion.
 
+        The wait between status checks grows by 1.5x while the job reports no
+        progress, up to max_poll_interval, and drops back to poll_interval as soon
+        as the job changes state or the number of crawled pages changes. Each wait is
+        jittered by +/-20% so that clients started together do not poll in lockstep,
+        but never drops below MIN_POLL_INTERVAL.
+
         Args:
             job_id (str): The ID of the crawl job.
-            headers (Dict[str, str]): The headers to include in the status check requests.
-            poll_interval (int): Secounds between status checks.
+            headers (Mapping[str, str]): The headers to include in the status check requests.
+            poll_interval (int): Initial seconds between status checks.
+            max_poll_interval (Optional[int]): Upper bound for the interval, MAX_POLL_INTERVAL if not set.
+            timeout (Optional[float]): Maximum seconds to wait for completion, no limit if not set.
 
         Returns:
             Any: The crawl results if the job is completed successfully.
 
         Raises:
             Exception: If the job fails or an error occurs during status checks.
+            TimeoutError: If the job does not complete within the timeout.
         """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        poll_interval = max(poll_interval, MIN_POLL_INTERVAL)
+        max_interval = max(poll_interval, max_poll_interval or MAX_POLL_INTERVAL)
+        interval = poll_interval
+        last_progress = None
+        status_url = f'{self.api_url}/v0/crawl/status/{job_id}'
         while True:
-            status_response = self._get_request(f'{self.api_url}/v0/crawl/status/{job_id}', headers)
+            status_response = self._get_request(status_url, headers)
             if status_response.status_code == 200:
-                status_data = status_response.json()
-                if status_data['status'] == 'completed':
+                status_data = _json_loads(status_response)
+                if not isinstance(status_data, dict):
+                    status_data = {}
+                status = status_data.get('status')
+                if status is None:
+                    raise Exception(f'Failed to check crawl status. Error: {status_data.get("error", "No status returned")}')
+                if status not in PENDING_CRAWL_STATUSES:
+                    # The job will not change anymore, don't keep its payload around
+                    with self._etag_lock:
+                        self._etag_cache.pop(status_url, None)
+                if status == 'completed':
                     if 'data' in status_data:
                         return status_data['data']
                     else:
                         raise Exception('Crawl job completed but no data was returned')
-                elif status_data['status'] in ['active', 'paused', 'pending', 'queued', 'waiting']:
-                    poll_interval=max(poll_interval,2)
-                    time.sleep(poll_interval)  # Wait for the specified interval before checking again
+                elif status in PENDING_CRAWL_STATUSES:
+                    progress = (status, status_data.get('current'))
+                    if progress != last_progress:
+                        interval = poll_interval
+                        last_progress = progress
+                    # Wait for the current interval, jittered, before checking again
+                    wait = max(interval * random.uniform(0.8, 1.2), MIN_POLL_INTERVAL)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f'Crawl job {job_id} did not complete within {timeout} seconds')
+                        wait = min(wait, remaining)
+                    time.sleep(wait)
+                    interval = min(interval * 1.5, max_interval)
                 else:
-                    raise Exception(f'Crawl job failed or was stopped. Status: {status_data["status"]}')
+                    raise Exception(f'Crawl job failed or was stopped. Status: {status}')
             else:
                 self._handle_error(status_response, 'check crawl status')
 
@@ -300,7 +559,15 @@ class FirecrawlApp:
         Raises:
             Exception: An exception with a message containing the status code and error details from the response.
         """
-        error_message = response.json().get('error', 'No additional error details provided.')
+        try:
+            body = _json_loads(response)
+        except ValueError:
+            # Proxies and gateways may answer with an HTML or empty body
+            body = None
+        if isinstance(body, dict):
+            error_message = body.get('error', 'No additional error details provided.')
+        else:
+            error_message = 'No additional error details provided.'
 
         if response.status_code == 402:
             message = f"Payment Required: Failed to {action}. {error_message}"
@@ -31,6 +31,9 @@ setup(
         'pytest',
         'python-dotenv',
     ],
+    extras_require={
+        'fast': ['orjson'],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 5 - Production/Stable",